@@ -28,6 +28,49 @@ DIST_DIR = SCRIPT_DIR / 'dist'
 BUILD_DIR = SCRIPT_DIR / 'build'
 ICON_PATH = SCRIPT_DIR / 'icon.ico'
 
+# Headless server build (no tray or window)
+HEADLESS_FILENAME = 'printflowd'
+
+# Modules used by printflow_agent.py
+AGENT_HIDDEN_IMPORTS = [
+    'flask',
+    'flask_cors',
+    'werkzeug',
+    'jinja2',
+    'markupsafe',
+    'orjson',
+    'cheroot',
+    'cheroot.wsgi',
+    'cheroot.ssl.builtin',
+    'cryptography',
+    'PIL',
+    'PIL.Image',
+    'numpy',
+    'win32print',
+    'win32event',
+]
+
+# Additional modules used by printflow_gui.py
+GUI_HIDDEN_IMPORTS = AGENT_HIDDEN_IMPORTS + [
+    'PIL.ImageDraw',
+    'pystray',
+    'pystray._win32',
+    'tkinter',
+    'tkinter.ttk',
+    'tkinter.messagebox',
+]
+
+# Kept out of the headless build entirely
+HEADLESS_EXCLUDES = [
+    'tkinter',
+    '_tkinter',
+    'pystray',
+]
+
+# Onedir builds start much faster since nothing is unpacked to a temp
+# directory on launch; set PYINSTALLER_BUILD_ONEFILE=1 for a single exe.
+BUILD_ONEFILE = os.environ.get('PYINSTALLER_BUILD_ONEFILE', '').lower() in ('1', 'true', 'yes')
+
 
 def create_application_icon():
     """Generate multi-resolution icon file."""
@@ -97,37 +140,15 @@ def create_application_icon():
     return ICON_PATH
 
 
-def run_pyinstaller():
+def run_pyinstaller(name, script, hidden_imports, windowed=True, excludes=()):
     """Execute PyInstaller to create executable."""
-    print("\nBuilding executable with PyInstaller...")
-    
-    hidden_imports = [
-        'flask',
-        'flask_cors',
-        'werkzeug',
-        'jinja2',
-        'markupsafe',
-        'cryptography',
-        'PIL',
-        'PIL.Image',
-        'PIL.ImageDraw',
-        'pystray',
-        'pystray._win32',
-        'win32print',
-        'win32ui',
-        'win32con',
-        'win32api',
-        'tkinter',
-        'tkinter.ttk',
-        'tkinter.messagebox',
-        'tkinter.scrolledtext',
-    ]
+    print(f"\nBuilding {name} with PyInstaller...")
     
     cmd = [
         sys.executable, '-m', 'PyInstaller',
-        '--name', APP_FILENAME,
-        '--onefile',
-        '--windowed',
+        '--name', name,
+        '--onefile' if BUILD_ONEFILE else '--onedir',
+        '--windowed' if windowed else '--console',
         '--noconfirm',
         '--clean',
         f'--icon={ICON_PATH}',
@@ -138,7 +159,10 @@ def run_pyinstaller():
     for module in hidden_imports:
         cmd.extend(['--hidden-import', module])
     
-    cmd.append(str(SCRIPT_DIR / 'printflow_gui.py'))
+    for module in excludes:
+        cmd.extend(['--exclude-module', module])
+    
+    cmd.append(str(SCRIPT_DIR / script))
     
     result = subprocess.run(cmd, cwd=SCRIPT_DIR)
     
@@ -146,13 +170,24 @@ def run_pyinstaller():
         print("PyInstaller build failed!")
         sys.exit(1)
     
-    print(f"\nExecutable created: {DIST_DIR / (APP_FILENAME + '.exe')}")
+    if BUILD_ONEFILE:
+        exe_path = DIST_DIR / (name + '.exe')
+    else:
+        exe_path = DIST_DIR / name / (name + '.exe')
+    print(f"\nExecutable created: {exe_path}")
 
 
 def create_installer_scripts():
     """Generate installer and uninstaller batch files."""
     print("\nCreating installer scripts...")
     
+    if BUILD_ONEFILE:
+        copy_command = f'copy /y "{APP_FILENAME}.exe" "%INSTALL_DIR%\\{APP_FILENAME}.exe" >nul'
+        app_dir = '%INSTALL_DIR%'
+    else:
+        copy_command = f'xcopy /E /I /Y "{APP_FILENAME}" "%INSTALL_DIR%\\{APP_FILENAME}" >nul'
+        app_dir = f'%INSTALL_DIR%\\{APP_FILENAME}'
+    
     install_script = f'''@echo off
 setlocal enabledelayedexpansion
 title {APP_NAME} Installer
@@ -175,6 +210,8 @@ if %errorlevel% neq 0 (
 
 :: Set installation directory
 set "INSTALL_DIR=%ProgramFiles%\\{APP_NAME}"
+set "APP_DIR={app_dir}"
+set "APP_EXE=%APP_DIR%\\{APP_FILENAME}.exe"
 
 echo Installing to: %INSTALL_DIR%
 echo.
@@ -182,11 +219,11 @@ echo.
 :: Create directories
 if not exist "%INSTALL_DIR%" mkdir "%INSTALL_DIR%"
 
-:: Copy executable
+:: Copy application files
 echo Copying files...
-copy /y "{APP_FILENAME}.exe" "%INSTALL_DIR%\\{APP_FILENAME}.exe" >nul
+{copy_command}
 if errorlevel 1 (
-    echo ERROR: Failed to copy executable!
+    echo ERROR: Failed to copy application files!
     pause
     exit /b 1
 )
@@ -194,14 +231,14 @@ if errorlevel 1 (
 :: Create Start Menu shortcut
 echo Creating shortcuts...
 set "START_MENU=%ProgramData%\\Microsoft\\Windows\\Start Menu\\Programs"
-powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%START_MENU%\\{APP_NAME}.lnk'); $s.TargetPath = '%INSTALL_DIR%\\{APP_FILENAME}.exe'; $s.WorkingDirectory = '%INSTALL_DIR%'; $s.Save()"
+powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%START_MENU%\\{APP_NAME}.lnk'); $s.TargetPath = '%APP_EXE%'; $s.WorkingDirectory = '%APP_DIR%'; $s.Save()"
 
 :: Create Desktop shortcut
-powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%USERPROFILE%\\Desktop\\{APP_NAME}.lnk'); $s.TargetPath = '%INSTALL_DIR%\\{APP_FILENAME}.exe'; $s.WorkingDirectory = '%INSTALL_DIR%'; $s.Save()"
+powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%USERPROFILE%\\Desktop\\{APP_NAME}.lnk'); $s.TargetPath = '%APP_EXE%'; $s.WorkingDirectory = '%APP_DIR%'; $s.Save()"
 
 :: Add to Windows Startup
 set "STARTUP=%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs\\Startup"
-powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%STARTUP%\\{APP_NAME}.lnk'); $s.TargetPath = '%INSTALL_DIR%\\{APP_FILENAME}.exe'; $s.WorkingDirectory = '%INSTALL_DIR%'; $s.Save()"
+powershell -Command "$ws = New-Object -ComObject WScript.Shell; $s = $ws.CreateShortcut('%STARTUP%\\{APP_NAME}.lnk'); $s.TargetPath = '%APP_EXE%'; $s.WorkingDirectory = '%APP_DIR%'; $s.Save()"
 
 :: Copy uninstaller
 copy /y "uninstall.bat" "%INSTALL_DIR%\\uninstall.bat" >nul
@@ -216,7 +253,7 @@ echo automatically when Windows starts.
 echo.
 echo Launch now? [Y/N]
 set /p LAUNCH=
-if /i "%LAUNCH%"=="Y" start "" "%INSTALL_DIR%\\{APP_FILENAME}.exe"
+if /i "%LAUNCH%"=="Y" start "" "%APP_EXE%"
 
 echo.
 pause
@@ -284,6 +321,13 @@ pause
 
 def create_readme():
     """Generate installation instructions."""
+    if BUILD_ONEFILE:
+        app_entry = f'`{APP_FILENAME}.exe` - Main application'
+        headless_entry = f'`{HEADLESS_FILENAME}.exe` - Headless server (no window or tray)'
+    else:
+        app_entry = f'`{APP_FILENAME}/` - Main application folder ({APP_FILENAME}.exe)'
+        headless_entry = f'`{HEADLESS_FILENAME}/` - Headless server folder ({HEADLESS_FILENAME}.exe, no window or tray)'
+    
     readme = f'''# {APP_NAME}
 
 Version {VERSION}
@@ -306,7 +350,8 @@ By {AUTHOR}
 
 ## Files
 
-- `{APP_FILENAME}.exe` - Main application
+- {app_entry}
+- {headless_entry}
 - `install.bat` - Installation script (run as admin)
 - `uninstall.bat` - Removal script
 
@@ -331,8 +376,15 @@ def main():
     # Create icon
     create_application_icon()
     
-    # Build executable
-    run_pyinstaller()
+    # Build executables
+    run_pyinstaller(APP_FILENAME, 'printflow_gui.py', GUI_HIDDEN_IMPORTS)
+    run_pyinstaller(
+        HEADLESS_FILENAME,
+        'printflow_agent.py',
+        AGENT_HIDDEN_IMPORTS,
+        windowed=False,
+        excludes=HEADLESS_EXCLUDES
+    )
     
     # Create installer scripts
     create_installer_scripts()
@@ -12,34 +12,26 @@ import os
 import sys
 import json
 import base64
+import ssl
 import socket
+import struct
 import logging
 import tempfile
 import platform
+import importlib
 import subprocess
 import ipaddress
+import time
+import uuid
+import queue
 from io import BytesIO
+from contextlib import contextmanager
+from functools import partial, lru_cache
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from threading import Thread
+from threading import Thread, Lock, Event
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-
-# Platform-specific imports
 SYSTEM = platform.system()
-if SYSTEM == 'Windows':
-    try:
-        import win32print
-        import win32ui
-        from PIL import ImageWin
-    except ImportError:
-        win32print = None
 
 # Application metadata
 APP_TITLE = 'PrintFlow Agent'
@@ -53,6 +45,9 @@ LOG_PATH = USER_DATA_DIR / 'agent.log'
 CERT_PATH = USER_DATA_DIR / 'server.crt'
 KEY_PATH = USER_DATA_DIR / 'server.key'
 
+# Worker threads for the WSGI server
+SERVER_THREADS = 8
+
 # Ensure data directory exists
 USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -73,6 +68,56 @@ ESCPOS_LINEFEED = b'\x0A'
 ESCPOS_CUT = b'\x1D\x56\x00'
 ESCPOS_RASTER_START = b'\x1D\x76\x30\x00'
 
+# Printer change detection
+PRINTER_CHANGE_PRINTER = 0x000000FF  # winspool.h
+CUPS_PRINTERS_CONF = Path('/etc/cups/printers.conf')
+
+# Heavy and platform-specific modules are imported on first use,
+# keeping them off the startup path
+_lazy_modules = {}
+
+
+def _lazy_import(name):
+    """Import a module on first use, returning None if it is unavailable."""
+    if name not in _lazy_modules:
+        try:
+            _lazy_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _lazy_modules[name] = None
+    return _lazy_modules[name]
+
+
+def _win32print():
+    """Return the win32print module on Windows, else None."""
+    if SYSTEM != 'Windows':
+        return None
+    return _lazy_import('win32print')
+
+
+@lru_cache(maxsize=1)
+def _raster_kernel():
+    """Return a Numba-compiled threshold+pack kernel, or None without Numba."""
+    numba = _lazy_import('numba')
+    if numba is None:
+        return None
+    
+    # Frozen builds have nowhere to write the on-disk JIT cache. Not
+    # parallel: print queues call this from several threads at once, which
+    # Numba's fallback workqueue threading layer aborts the process on.
+    @numba.njit(cache=not getattr(sys, 'frozen', False))
+    def pack(gray, out):
+        height, width = gray.shape
+        for y in range(height):
+            for xb in range(out.shape[1]):
+                byte = 0
+                for bit in range(8):
+                    x = xb * 8 + bit
+                    if x < width and gray[y, x] < 128:
+                        byte |= 0x80 >> bit
+                out[y, xb] = byte
+    
+    return pack
+
 
 class Configuration:
     """Manages application settings."""
@@ -82,10 +127,17 @@ class Configuration:
         'enable_auto_cut': False,
         'start_minimized': False,
         'log_level': 'INFO',
+        # 'ec' (P-256) or 'ed25519'; browsers do not accept Ed25519
+        # certificates, so only use it with non-browser clients
+        'cert_key_type': 'ec',
+        # Plain HTTP on 127.0.0.1:<port + 1> for clients on this machine
+        'enable_loopback_http': True,
     }
     
     def __init__(self):
         self._settings = self.DEFAULT_SETTINGS.copy()
+        self._batch_depth = 0
+        self._dirty = False
         self._load()
     
     def _load(self):
@@ -98,9 +150,17 @@ class Configuration:
                 logger.warning(f'Failed to load config: {e}')
     
     def save(self):
+        # Write to a temp file and rename so a crash never leaves a
+        # truncated config behind
+        tmp_path = CONFIG_PATH.with_suffix('.json.tmp')
         try:
-            with open(CONFIG_PATH, 'w') as f:
+            with open(tmp_path, 'w') as f:
                 json.dump(self._settings, f, indent=2)
+                # Data must be on disk before the rename, or a power loss
+                # can still leave an empty config.json
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, CONFIG_PATH)
         except Exception as e:
             logger.error(f'Failed to save config: {e}')
     
@@ -108,8 +168,25 @@ class Configuration:
         return self._settings.get(key, default)
     
     def set(self, key, value):
+        if key in self._settings and self._settings[key] == value:
+            return
         self._settings[key] = value
-        self.save()
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save()
+    
+    @contextmanager
+    def batch(self):
+        """Defer saving until the block exits, for multi-key updates."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._dirty = False
+                self.save()
 
 
 class CertificateManager:
@@ -128,15 +205,16 @@ class CertificateManager:
             from cryptography import x509
             from cryptography.x509.oid import NameOID
             from cryptography.hazmat.primitives import hashes, serialization
-            from cryptography.hazmat.primitives.asymmetric import rsa
+            from cryptography.hazmat.primitives.asymmetric import ec, ed25519
             from cryptography.hazmat.backends import default_backend
             
-            # Generate private key
-            private_key = rsa.generate_private_key(
-                public_exponent=65537,
-                key_size=2048,
-                backend=default_backend()
-            )
+            # Generate private key (both are far cheaper to generate than RSA)
+            if config.get('cert_key_type') == 'ed25519':
+                private_key = ed25519.Ed25519PrivateKey.generate()
+                signature_hash = None  # Ed25519 signs without a separate digest
+            else:
+                private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+                signature_hash = hashes.SHA256()
             
             # Build certificate
             hostname = socket.gethostname()
@@ -152,11 +230,7 @@ class CertificateManager:
                 x509.IPAddress(ipaddress.IPv4Address('127.0.0.1')),
             ]
             
-            for ip in NetworkInfo.get_local_addresses():
-                try:
-                    alt_names.append(x509.IPAddress(ipaddress.IPv4Address(ip)))
-                except:
-                    pass
+            alt_names.extend(x509.IPAddress(ip) for ip in CertificateManager._san_ips())
             
             cert = (
                 x509.CertificateBuilder()
@@ -170,7 +244,7 @@ class CertificateManager:
                     x509.SubjectAlternativeName(alt_names),
                     critical=False
                 )
-                .sign(private_key, hashes.SHA256(), default_backend())
+                .sign(private_key, signature_hash, default_backend())
             )
             
             # Save certificate
@@ -181,7 +255,7 @@ class CertificateManager:
             with open(KEY_PATH, 'wb') as f:
                 f.write(private_key.private_bytes(
                     encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.TraditionalOpenSSL,
+                    format=serialization.PrivateFormat.PKCS8,
                     encryption_algorithm=serialization.NoEncryption()
                 ))
             
@@ -192,20 +266,39 @@ class CertificateManager:
             logger.warning('cryptography library not available, trying OpenSSL')
             return CertificateManager._generate_with_openssl()
     
+    @staticmethod
+    def _san_ips():
+        """Local IPv4 addresses for the certificate, besides 127.0.0.1."""
+        local_ips = set()
+        for ip in NetworkInfo.get_local_addresses():
+            try:
+                local_ips.add(ipaddress.IPv4Address(ip))
+            except ValueError:
+                pass
+        local_ips.discard(ipaddress.IPv4Address('127.0.0.1'))
+        # Sorted so the SAN list is identical across runs
+        return sorted(local_ips)
+    
     @staticmethod
     def _generate_with_openssl():
         """Fallback certificate generation using OpenSSL CLI."""
         hostname = socket.gethostname()
-        ips = ','.join([f'IP:{ip}' for ip in NetworkInfo.get_local_addresses()])
+        san = ['DNS:localhost', f'DNS:{hostname}', 'IP:127.0.0.1']
+        san.extend(f'IP:{ip}' for ip in CertificateManager._san_ips())
+        
+        if config.get('cert_key_type') == 'ed25519':
+            key_args = ['-newkey', 'ed25519']
+        else:
+            key_args = ['-newkey', 'ec', '-pkeyopt', 'ec_paramgen_curve:P-256']
         
         cmd = [
-            'openssl', 'req', '-x509', '-newkey', 'rsa:2048',
+            'openssl', 'req', '-x509', *key_args,
             '-keyout', str(KEY_PATH),
             '-out', str(CERT_PATH),
             '-days', '3650',
             '-nodes',
             '-subj', f'/CN={hostname}/O={APP_TITLE}',
-            '-addext', f'subjectAltName=DNS:localhost,DNS:{hostname},IP:127.0.0.1,{ips}'
+            '-addext', f'subjectAltName={",".join(san)}'
         ]
         
         try:
@@ -220,32 +313,46 @@ class CertificateManager:
 class NetworkInfo:
     """Network utility functions."""
     
+    # Interface addresses rarely change; avoid re-probing on every call
+    CACHE_TTL = 30.0
+    _cache = {'time': 0.0, 'addresses': None}
+    _cache_lock = Lock()
+    
     @staticmethod
     def get_local_addresses():
-        """Get all local IP addresses."""
+        """Get all local IP addresses, cached for CACHE_TTL seconds."""
+        cache = NetworkInfo._cache
+        with NetworkInfo._cache_lock:
+            if (cache['addresses'] is None
+                    or time.monotonic() - cache['time'] >= NetworkInfo.CACHE_TTL):
+                cache['addresses'] = NetworkInfo._probe_addresses()
+                cache['time'] = time.monotonic()
+            return list(cache['addresses'])
+    
+    @staticmethod
+    def invalidate_cache():
+        """Force the next get_local_addresses() call to probe again."""
+        with NetworkInfo._cache_lock:
+            NetworkInfo._cache['addresses'] = None
+    
+    @staticmethod
+    def _probe_addresses():
+        """Query the system for local IP addresses."""
         addresses = []
         hostname = socket.gethostname()
         
-        # Get hostname-based IP
+        # Get hostname-based IPs (on Windows this covers every adapter)
         try:
-            addresses.append(socket.gethostbyname(hostname))
-        except:
+            for info in socket.getaddrinfo(hostname, None, socket.AF_INET):
+                ip = info[4][0]
+                if not ip.startswith('127.') and not ip.startswith('169.254.'):
+                    addresses.append(ip)
+        except OSError:
             pass
         
         # Get interface IPs
-        try:
-            import subprocess
-            if SYSTEM == 'Windows':
-                result = subprocess.run(
-                    ['powershell', '-Command', 
-                     '(Get-NetIPAddress -AddressFamily IPv4).IPAddress'],
-                    capture_output=True, text=True
-                )
-                for line in result.stdout.strip().split('\n'):
-                    ip = line.strip()
-                    if ip and not ip.startswith('127.') and not ip.startswith('169.254.'):
-                        addresses.append(ip)
-            else:
+        if SYSTEM == 'Linux':
+            try:
                 result = subprocess.run(
                     ['hostname', '-I'],
                     capture_output=True, text=True
@@ -253,8 +360,8 @@ class NetworkInfo:
                 for ip in result.stdout.strip().split():
                     if ip and not ip.startswith('127.'):
                         addresses.append(ip)
-        except:
-            pass
+            except:
+                pass
         
         # Get default route IP
         try:
@@ -265,18 +372,122 @@ class NetworkInfo:
         except:
             pass
         
-        return list(set(addresses))
+        # Ordered dedup keeps results stable between calls
+        return list(dict.fromkeys(addresses))
 
 
 class PrinterManager:
     """Handles printer discovery and print jobs."""
     
+    # Enumeration goes through the spooler / lpstat, so /status polls are
+    # served from a cache. While the change watcher runs the cache is
+    # refreshed when printers change, and at least every WATCHED_TTL since
+    # cupsd writes printers.conf late and temporary queues never touch it;
+    # otherwise it expires after CACHE_TTL.
+    CACHE_TTL = 5.0
+    WATCHED_TTL = 30.0
+    WATCH_INTERVAL = 2.0
+    _cache = {'time': 0.0, 'printers': None}
+    _cache_lock = Lock()
+    _watcher = None
+    _watching = False
+    
     @staticmethod
     def list_printers():
-        """Get available printers on the system."""
+        """Get available printers from the cache."""
+        PrinterManager._start_watcher()
+        cache = PrinterManager._cache
+        with PrinterManager._cache_lock:
+            ttl = PrinterManager.WATCHED_TTL if PrinterManager._watching else PrinterManager.CACHE_TTL
+            expired = time.monotonic() - cache['time'] >= ttl
+            if cache['printers'] is None or expired:
+                cache['printers'] = PrinterManager._enumerate_printers()
+                cache['time'] = time.monotonic()
+            return list(cache['printers'])
+    
+    @staticmethod
+    def invalidate_cache():
+        """Force the next list_printers() call to enumerate again."""
+        with PrinterManager._cache_lock:
+            PrinterManager._cache['printers'] = None
+    
+    @staticmethod
+    def _start_watcher():
+        """Start the printer change watcher thread once per process."""
+        if PrinterManager._watcher is not None:
+            return
+        with PrinterManager._cache_lock:
+            if PrinterManager._watcher is None:
+                PrinterManager._watcher = Thread(
+                    target=PrinterManager._watch_printers,
+                    daemon=True,
+                    name='printflow-printer-watch'
+                )
+                PrinterManager._watcher.start()
+    
+    @staticmethod
+    def _set_watching(active):
+        """Switch between change-driven and TTL-based cache expiry."""
+        # Changes made before the watcher was armed would be missed, so
+        # always drop the cached list when switching modes
+        with PrinterManager._cache_lock:
+            PrinterManager._cache['printers'] = None
+            PrinterManager._watching = active
+    
+    @staticmethod
+    def _watch_printers():
+        """Invalidate the printer cache whenever printers change."""
+        try:
+            win32print = _win32print()
+            if win32print:
+                PrinterManager._watch_windows(win32print)
+            elif SYSTEM in ('Linux', 'Darwin'):
+                PrinterManager._watch_cups()
+        except Exception as e:
+            logger.info(f'Printer change watcher unavailable: {e}')
+        finally:
+            PrinterManager._set_watching(False)
+    
+    @staticmethod
+    def _watch_windows(win32print):
+        """Wait on spooler change notifications for the local print server."""
+        import win32event
+        
+        server = win32print.OpenPrinter(None)
+        try:
+            change = win32print.FindFirstPrinterChangeNotification(
+                server, PRINTER_CHANGE_PRINTER, 0, None
+            )
+            try:
+                PrinterManager._set_watching(True)
+                while True:
+                    win32event.WaitForSingleObject(change, win32event.INFINITE)
+                    win32print.FindNextPrinterChangeNotification(change, None)
+                    PrinterManager.invalidate_cache()
+            finally:
+                win32print.FindClosePrinterChangeNotification(change)
+        finally:
+            win32print.ClosePrinter(server)
+    
+    @staticmethod
+    def _watch_cups():
+        """Poll the CUPS printer configuration for modifications."""
+        last_mtime = CUPS_PRINTERS_CONF.stat().st_mtime_ns
+        PrinterManager._set_watching(True)
+        while True:
+            time.sleep(PrinterManager.WATCH_INTERVAL)
+            mtime = CUPS_PRINTERS_CONF.stat().st_mtime_ns
+            if mtime != last_mtime:
+                last_mtime = mtime
+                PrinterManager.invalidate_cache()
+    
+    @staticmethod
+    def _enumerate_printers():
+        """Query the system for available printers."""
         printers = []
+        win32print = _win32print()
         
-        if SYSTEM == 'Windows' and win32print:
+        if win32print:
             try:
                 flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
                 for printer in win32print.EnumPrinters(flags):
@@ -302,19 +513,30 @@ class PrinterManager:
     
     @staticmethod
     def print_raw(printer_name, data, with_cut=False):
-        """Send raw bytes to printer."""
-        if SYSTEM == 'Windows' and win32print:
+        """Send raw bytes, or a sequence of byte chunks, to printer."""
+        if _win32print():
             return PrinterManager._print_raw_windows(printer_name, data, with_cut)
         elif SYSTEM in ('Linux', 'Darwin'):
             return PrinterManager._print_raw_cups(printer_name, data, with_cut)
         else:
             raise RuntimeError(f'Unsupported platform: {SYSTEM}')
     
+    @staticmethod
+    def _as_chunks(data, with_cut):
+        """Normalize print data to a list of byte chunks."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            chunks = [data]
+        else:
+            chunks = list(data)
+        if with_cut:
+            chunks.append(ESCPOS_CUT)
+        return chunks
+    
     @staticmethod
     def _print_raw_windows(printer_name, data, with_cut):
         """Windows raw printing via win32print."""
-        if with_cut:
-            data = data + ESCPOS_CUT
+        chunks = PrinterManager._as_chunks(data, with_cut)
+        win32print = _win32print()
         
         try:
             handle = win32print.OpenPrinter(printer_name)
@@ -322,7 +544,8 @@ class PrinterManager:
                 job = win32print.StartDocPrinter(handle, 1, ('PrintFlow Job', None, 'RAW'))
                 try:
                     win32print.StartPagePrinter(handle)
-                    win32print.WritePrinter(handle, data)
+                    for chunk in chunks:
+                        win32print.WritePrinter(handle, chunk)
                     win32print.EndPagePrinter(handle)
                 finally:
                     win32print.EndDocPrinter(handle)
@@ -336,21 +559,26 @@ class PrinterManager:
     @staticmethod
     def _print_raw_cups(printer_name, data, with_cut):
         """Linux/macOS raw printing via CUPS."""
-        if with_cut:
-            data = data + ESCPOS_CUT
+        chunks = PrinterManager._as_chunks(data, with_cut)
         
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.raw') as f:
-                f.write(data)
-                temp_path = f.name
-            
-            cmd = ['lp', '-d', printer_name, '-o', 'raw', temp_path]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            os.unlink(temp_path)
+            # lp reads the job from stdin when no file is given
+            cmd = ['lp', '-d', printer_name, '-o', 'raw']
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            try:
+                for chunk in chunks:
+                    proc.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # lp exited early; its stderr says why
+            _, stderr = proc.communicate()
             
-            if result.returncode != 0:
-                raise RuntimeError(result.stderr or 'lp command failed')
+            if proc.returncode != 0:
+                raise RuntimeError(stderr.decode(errors='replace').strip() or 'lp command failed')
             
             return True
         except Exception as e:
@@ -360,168 +588,330 @@ class PrinterManager:
     @staticmethod
     def print_image(printer_name, image_data, with_cut=False):
         """Print image by converting to ESC/POS raster."""
+        Image = _lazy_import('PIL.Image')
         if not Image:
             raise RuntimeError('Pillow library not available')
+        if not _lazy_import('numpy'):
+            raise RuntimeError('NumPy library not available')
         
-        # Decode and process image
+        # Decode and convert to grayscale
         img = Image.open(BytesIO(image_data))
-        
-        # Convert to grayscale then monochrome
         img = img.convert('L')
-        img = img.point(lambda x: 0 if x < 128 else 255, '1')
         
         # Resize to printer width (typically 576 pixels for 80mm paper)
         max_width = 576
+        factor = img.width // max_width
+        if factor >= 2:
+            # Fast integer box reduction first, leaving at most a 2x
+            # fractional remainder for the filtered resize below
+            img = img.reduce(factor)
         if img.width > max_width:
             ratio = max_width / img.width
             new_height = int(img.height * ratio)
-            img = img.resize((max_width, new_height), Image.LANCZOS)
+            resampling = getattr(Image, 'Resampling', Image)
+            # BILINEAR is close enough for mild downscales and much cheaper
+            img = img.resize((max_width, new_height), resampling.BILINEAR)
         
         # Convert to ESC/POS raster format
-        raster_data = PrinterManager._image_to_raster(img)
+        raster_chunks = PrinterManager._image_to_raster(img)
         
-        # Combine with cut command if needed
-        output = ESCPOS_INIT + raster_data
-        if with_cut:
-            output += ESCPOS_CUT
+        # Chunks are written in order, so nothing is concatenated here
+        output = [ESCPOS_INIT, *raster_chunks]
         
-        return PrinterManager.print_raw(printer_name, output, with_cut=False)
+        return PrinterManager.print_raw(printer_name, output, with_cut=with_cut)
     
     @staticmethod
     def _image_to_raster(img):
-        """Convert PIL Image to ESC/POS raster bytes."""
+        """Convert grayscale PIL Image to ESC/POS raster chunks (header, body)."""
+        np = _lazy_import('numpy')
         width = img.width
         height = img.height
         
         # Width must be multiple of 8
         padded_width = ((width + 7) // 8) * 8
-        
-        if padded_width != width:
-            new_img = Image.new('1', (padded_width, height), 1)
-            new_img.paste(img, (0, 0))
-            img = new_img
-        
         bytes_per_row = padded_width // 8
         
-        # Build raster command
-        width_low = bytes_per_row % 256
-        width_high = bytes_per_row // 256
-        height_low = height % 256
-        height_high = height // 256
+        # Build raster command (xL xH yL yH, little-endian)
+        raster_header = ESCPOS_RASTER_START + struct.pack('<HH', bytes_per_row, height)
         
-        raster_header = ESCPOS_RASTER_START + bytes([width_low, width_high, height_low, height_high])
+        # Dark pixels become set bits, packed MSB-first per row
+        gray = np.asarray(img, dtype=np.uint8)
+        kernel = _raster_kernel()
+        if kernel is not None:
+            packed = np.empty((height, bytes_per_row), dtype=np.uint8)
+            kernel(gray, packed)
+        else:
+            bits = (gray < 128).astype(np.uint8)
+            if padded_width != width:
+                bits = np.pad(bits, ((0, 0), (0, padded_width - width)))
+            packed = np.packbits(bits, axis=1, bitorder='big')
         
-        # Get image data
-        pixels = img.load()
-        raster_body = bytearray()
+        raster_body = packed.tobytes()
         
-        for y in range(height):
-            row_byte = 0
-            bit_pos = 7
+        return [raster_header, raster_body]
+
+
+class PrintQueue:
+    """Runs print jobs in the background, in FIFO order per printer."""
+    
+    MAX_PENDING = 32
+    # Printer names come from the client, so cap how many drain at once
+    MAX_ACTIVE_PRINTERS = 16
+    
+    def __init__(self):
+        # A printer has a queue here exactly while its drain thread runs
+        self._queues = {}
+        self._lock = Lock()
+    
+    def submit(self, printer_name, job):
+        """Queue a callable for a printer; raises queue.Full when backlogged."""
+        with self._lock:
+            jobs = self._queues.get(printer_name)
+            if jobs is not None:
+                jobs.put_nowait(job)
+                return
             
-            for x in range(padded_width):
-                if x < width and pixels[x, y] == 0:
-                    row_byte |= (1 << bit_pos)
-                
-                bit_pos -= 1
-                
-                if bit_pos < 0:
-                    raster_body.append(row_byte)
-                    row_byte = 0
-                    bit_pos = 7
-        
-        return raster_header + bytes(raster_body)
+            if len(self._queues) >= self.MAX_ACTIVE_PRINTERS:
+                raise queue.Full
+            jobs = self._queues[printer_name] = queue.Queue(maxsize=self.MAX_PENDING)
+            jobs.put_nowait(job)
+            # One drain thread per printer keeps its jobs strictly ordered.
+            # It is a daemon so a job stuck on an offline printer can't
+            # keep the process alive after Quit.
+            Thread(
+                target=self._drain,
+                args=(printer_name, jobs),
+                daemon=True,
+                name=f'printflow-job-{printer_name}'
+            ).start()
+    
+    def _drain(self, printer_name, jobs):
+        while True:
+            with self._lock:
+                try:
+                    job = jobs.get_nowait()
+                except queue.Empty:
+                    # Drop the idle queue so unused names don't accumulate
+                    del self._queues[printer_name]
+                    return
+            try:
+                job()
+            except Exception:
+                logger.exception(f'Print job failed on {printer_name}')
+
 
+def process_print_job(job_id, printer_name, raw_type, raw_data, apply_cut):
+    """Decode and print a single job; runs on a PrintQueue worker."""
+    data_bytes = base64.b64decode(raw_data)
+    
+    # Process based on type
+    if raw_type in ('image', 'image_cut'):
+        PrinterManager.print_image(printer_name, data_bytes, with_cut=apply_cut)
+    elif raw_type == 'pdf':
+        # PDF printing handled differently per platform
+        if SYSTEM == 'Windows':
+            # Save and print via shell
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as f:
+                f.write(data_bytes)
+                temp_path = f.name
+            
+            subprocess.run([
+                'powershell', '-Command',
+                f'Start-Process -FilePath "{temp_path}" -Verb Print'
+            ])
+        else:
+            PrinterManager.print_raw(printer_name, data_bytes, with_cut=False)
+    else:
+        # Text/raw mode
+        PrinterManager.print_raw(printer_name, data_bytes, with_cut=apply_cut)
+    
+    logger.info(f'Print job {job_id} sent: {printer_name} ({raw_type}, {len(data_bytes)} bytes)')
 
-# Flask application
-app = Flask(__name__)
-CORS(app)
 
 # Global config instance
 config = Configuration()
 
+# Global print queue
+print_queue = PrintQueue()
 
-@app.route('/status', methods=['GET'])
-def status():
-    """Health check endpoint."""
-    return jsonify({
-        'status': 'online',
-        'application': APP_TITLE,
-        'version': APP_VERSION,
-        'printers': PrinterManager.list_printers(),
-        'platform': SYSTEM,
-    })
+# Set while the loopback HTTP listener is accepting connections
+loopback_ready = Event()
 
 
-@app.route('/printers', methods=['GET'])
-def list_printers():
-    """List available printers."""
-    return jsonify({
-        'printers': PrinterManager.list_printers()
-    })
+def _install_orjson_provider(app):
+    """Serialize JSON with orjson when available (needs Flask 2.2+)."""
+    orjson = _lazy_import('orjson')
+    provider = _lazy_import('flask.json.provider')
+    if orjson is None or provider is None:
+        return
+    
+    class ORJSONProvider(provider.JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+        
+        def response(self, *args, **kwargs):
+            # Same argument rules as jsonify(), without Flask's private helper
+            if args and kwargs:
+                raise TypeError('response() takes either args or kwargs, not both')
+            if len(args) == 1:
+                obj = args[0]
+            else:
+                obj = list(args) if args else (kwargs or None)
+            
+            # Hand orjson's bytes straight to the response, no str round-trip
+            from flask import current_app
+            return current_app.response_class(orjson.dumps(obj), mimetype='application/json')
+    
+    app.json = ORJSONProvider(app)
 
 
-@app.route('/print_raw', methods=['POST'])
-def handle_print():
-    """Process incoming print job."""
-    try:
-        payload = request.get_json()
-        
-        printer_name = payload.get('printer_name')
-        raw_type = payload.get('raw_type', 'text')
-        raw_data = payload.get('raw_data', '')
-        
-        if not printer_name:
-            return jsonify({'error': 'Missing printer_name'}), 400
-        
-        if not raw_data:
-            return jsonify({'error': 'Missing raw_data'}), 400
-        
-        # Decode base64 data
-        data_bytes = base64.b64decode(raw_data)
-        
-        # Determine if auto-cut should be applied
-        auto_cut = config.get('enable_auto_cut', False)
-        apply_cut = auto_cut or raw_type.endswith('_cut')
-        
-        # Process based on type
-        if raw_type in ('image', 'image_cut'):
-            PrinterManager.print_image(printer_name, data_bytes, with_cut=apply_cut)
-        elif raw_type == 'pdf':
-            # PDF printing handled differently per platform
-            if SYSTEM == 'Windows':
-                # Save and print via shell
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as f:
-                    f.write(data_bytes)
-                    temp_path = f.name
-                
-                subprocess.run([
-                    'powershell', '-Command',
-                    f'Start-Process -FilePath "{temp_path}" -Verb Print'
-                ])
-            else:
-                PrinterManager.print_raw(printer_name, data_bytes, with_cut=False)
-        else:
-            # Text/raw mode
-            PrinterManager.print_raw(printer_name, data_bytes, with_cut=apply_cut)
-        
-        logger.info(f'Print job sent: {printer_name} ({raw_type}, {len(data_bytes)} bytes)')
-        
+def create_app(endpoints=None):
+    """Build the Flask application; Flask is only imported here.
+    
+    endpoints maps scheme names to the URLs advertised by /status.
+    """
+    from flask import Flask, request, jsonify
+    from flask_cors import CORS
+    
+    app = Flask(__name__)
+    CORS(app)
+    _install_orjson_provider(app)
+    
+    @app.route('/status', methods=['GET'])
+    def status():
+        """Health check endpoint."""
         return jsonify({
-            'success': True,
-            'message': f'Printed to {printer_name}'
+            'status': 'online',
+            'application': APP_TITLE,
+            'version': APP_VERSION,
+            'printers': PrinterManager.list_printers(),
+            'platform': SYSTEM,
+            'endpoints': endpoints or {},
         })
-        
-    except Exception as e:
-        logger.exception('Print job failed')
+    
+    @app.route('/printers', methods=['GET'])
+    def list_printers():
+        """List available printers."""
         return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+            'printers': PrinterManager.list_printers()
+        })
+    
+    @app.route('/print_raw', methods=['POST'])
+    def handle_print():
+        """Process incoming print job."""
+        try:
+            payload = request.get_json()
+            
+            printer_name = payload.get('printer_name')
+            raw_type = payload.get('raw_type', 'text')
+            raw_data = payload.get('raw_data', '')
+            
+            if not printer_name:
+                return jsonify({'error': 'Missing printer_name'}), 400
+            
+            if not raw_data:
+                return jsonify({'error': 'Missing raw_data'}), 400
+            
+            # Determine if auto-cut should be applied
+            auto_cut = config.get('enable_auto_cut', False)
+            apply_cut = auto_cut or raw_type.endswith('_cut')
+            
+            # Decoding and printing happen on the print queue
+            job_id = str(uuid.uuid4())
+            job = partial(process_print_job, job_id, printer_name, raw_type, raw_data, apply_cut)
+            try:
+                print_queue.submit(printer_name, job)
+            except queue.Full:
+                logger.warning(f'Print queue full for {printer_name}, rejecting job')
+                return jsonify({
+                    'success': False,
+                    'error': f'Print queue for {printer_name} is full'
+                }), 503
+            
+            return jsonify({
+                'success': True,
+                'accepted': True,
+                'job_id': job_id,
+                'message': f'Queued for {printer_name}'
+            }), 202
+            
+        except Exception as e:
+            logger.exception('Print job failed')
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
 
+    return app
 
-def run_server(port=None):
-    """Start the Flask server."""
+
+def create_ssl_context(cert_path, key_path):
+    """Build the server TLS context shared by every connection."""
+    # Server contexts issue session tickets by default, so clients that
+    # reconnect for each print job can resume instead of full handshakes
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.load_cert_chain(cert_path, key_path)
+    return ctx
+
+
+def _run_loopback_server(app, port):
+    """Serve plain HTTP on 127.0.0.1, skipping TLS for same-host clients."""
+    try:
+        logger.info(f'Starting loopback HTTP server on 127.0.0.1:{port}')
+        wsgi = _lazy_import('cheroot.wsgi')
+        if wsgi is None:
+            app.run(host='127.0.0.1', port=port, threaded=True, use_reloader=False)
+            return
+        
+        server = wsgi.Server(('127.0.0.1', port), app, numthreads=SERVER_THREADS)
+        try:
+            server.prepare()
+            loopback_ready.set()
+            server.serve()
+        finally:
+            loopback_ready.clear()
+            server.stop()
+    except Exception:
+        # The HTTPS server keeps running; only the fast path is lost
+        logger.exception('Loopback HTTP server failed')
+
+
+def _serve_https(app, port, cert_path, key_path, ssl_context):
+    """Serve the app over HTTPS on all interfaces until stopped."""
+    wsgi = _lazy_import('cheroot.wsgi')
+    if wsgi is None:
+        logger.warning('cheroot not available, using Flask development server')
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            ssl_context=ssl_context,
+            threaded=True,
+            use_reloader=False,
+        )
+        return
+    
+    from cheroot.ssl.builtin import BuiltinSSLAdapter
+    
+    # cheroot keeps HTTP/1.1 connections alive between requests
+    server = wsgi.Server(('0.0.0.0', port), app, numthreads=SERVER_THREADS)
+    server.ssl_adapter = BuiltinSSLAdapter(cert_path, key_path)
+    server.ssl_adapter.context = ssl_context
+    try:
+        server.start()
+    finally:
+        server.stop()
+
+
+def run_server(port=None, attempts=1, retry_delay=2.0):
+    """Start the Flask server.
+    
+    Binding the HTTPS port is tried up to `attempts` times, e.g. while a
+    previous instance still holds it; the loopback listener starts once.
+    """
     if port is None:
         port = config.get('port', 5000)
     
@@ -532,17 +922,52 @@ def run_server(port=None):
         logger.info(f'Starting server on port {port}')
         logger.info(f'Local addresses: {NetworkInfo.get_local_addresses()}')
         
-        app.run(
-            host='0.0.0.0',
-            port=port,
-            ssl_context=(cert_path, key_path),
-            threaded=True,
-            use_reloader=False,
-        )
+        endpoints = {'https': f'https://localhost:{port}'}
+        loopback_port = port + 1
+        if config.get('enable_loopback_http', True):
+            endpoints['http'] = f'http://127.0.0.1:{loopback_port}'
+        
+        app = create_app(endpoints)
+        ssl_context = create_ssl_context(cert_path, key_path)
+        
+        if 'http' in endpoints:
+            Thread(
+                target=_run_loopback_server,
+                args=(app, loopback_port),
+                daemon=True,
+                name='printflow-loopback'
+            ).start()
+        
+        for attempt in range(1, attempts + 1):
+            try:
+                _serve_https(app, port, cert_path, key_path, ssl_context)
+                return
+            except OSError as e:
+                if attempt == attempts:
+                    raise
+                logger.warning(f'HTTPS port {port} unavailable ({e}), retry {attempt}/{attempts - 1}')
+                time.sleep(retry_delay)
     except Exception as e:
         logger.exception('Server failed to start')
         raise
 
 
+def main(argv=None):
+    """Command-line entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='printflow_agent', description=APP_TITLE)
+    parser.add_argument('--port', type=int, help='server port (defaults to the configured port)')
+    parser.add_argument('--list-printers', action='store_true', help='list available printers and exit')
+    args = parser.parse_args(argv)
+    
+    if args.list_printers:
+        for name in PrinterManager.list_printers():
+            print(name)
+        return
+    
+    run_server(args.port)
+
+
 if __name__ == '__main__':
-    run_server()
+    main()
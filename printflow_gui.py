@@ -6,30 +6,36 @@ Copyright 2024 Yasin Elabe
 License: Proprietary
 """
 
+import io
 import os
+import importlib.util
 import sys
+import time
+import queue
+import subprocess
 import webbrowser
 import threading
+import weakref
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 
 # Import core agent
 from printflow_agent import (
     APP_TITLE, APP_VERSION, APP_AUTHOR,
     config, run_server, NetworkInfo, PrinterManager,
-    LOG_PATH, USER_DATA_DIR
+    LOG_PATH, USER_DATA_DIR, logger, loopback_ready
 )
 
 # GUI imports
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
 
-try:
-    import pystray
-    from PIL import Image as PilImage, ImageDraw
-    HAS_TRAY = True
-except ImportError:
-    HAS_TRAY = False
-    PilImage = None
+# pystray and Pillow are only imported when the tray icon is created
+HAS_TRAY = (
+    importlib.util.find_spec('pystray') is not None
+    and importlib.util.find_spec('PIL') is not None
+)
 
 
 # Color scheme (Odoo-inspired)
@@ -46,21 +52,144 @@ PALETTE = {
     'border': '#DEE2E6',
 }
 
+# Log viewer shows only the end of the log file
+LOG_TAIL_BYTES = 256 * 1024
+LOG_TAIL_LINES = 500
+LOG_READ_CHUNK = 128 * 1024
+LOG_INSERT_BATCH = 50
+
+# Refresh clicks within this many seconds reuse the last printer list
+PRINTER_REFRESH_TTL = 2.0
+
+# How often the Tk thread picks up results posted by worker threads (ms)
+UI_POLL_INTERVAL = 100
+
+# HTTPS bind attempts before giving up, e.g. while the port is still held
+SERVER_START_ATTEMPTS = 3
+SERVER_RETRY_DELAY = 2.0
+
+# Tk roots whose ttk styles have already been configured
+_STYLED_ROOTS = weakref.WeakSet()
+
+
+def _read_log_tail():
+    """Return the last LOG_TAIL_LINES lines of the log file."""
+    with LOG_PATH.open('rb') as raw:
+        # Read only the tail so large logs don't load into memory
+        raw.seek(0, os.SEEK_END)
+        offset = max(0, raw.tell() - LOG_TAIL_BYTES)
+        raw.seek(offset)
+        
+        with io.TextIOWrapper(raw, encoding='utf-8', errors='replace') as reader:
+            # Decode in larger batches than the 8 KB default; the
+            # attribute is undocumented, so don't rely on it existing
+            try:
+                reader._CHUNK_SIZE = LOG_READ_CHUNK
+            except AttributeError:
+                pass
+            
+            if offset:
+                # First line is most likely cut in half
+                reader.readline()
+            
+            return deque(reader, maxlen=LOG_TAIL_LINES)
+
+
+@lru_cache(maxsize=1)
+def _build_tray_icon():
+    """Draw the tray icon image; built once per process."""
+    from PIL import Image as PilImage, ImageDraw
+    
+    icon_size = 64
+    icon_img = PilImage.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(icon_img)
+    
+    # Draw printer shape
+    draw.rectangle([8, 16, 56, 48], fill=PALETTE['primary'], outline=None)
+    draw.rectangle([16, 8, 48, 20], fill=PALETTE['surface'], outline=PALETTE['primary'])
+    draw.rectangle([12, 44, 52, 56], fill=PALETTE['surface'], outline=PALETTE['primary'])
+    
+    return icon_img
+
+
+@lru_cache(maxsize=4)
+def _url_list_for(port, addrs):
+    """Return the connection URLs for a port and tuple of local addresses."""
+    return (f'https://localhost:{port}', *(f'https://{ip}:{port}' for ip in addrs))
+
+
+def _probe_addresses_fresh():
+    """Re-probe local addresses; blocks, so call it from a worker thread."""
+    # invalidate_cache() waits on the lock a running probe holds
+    NetworkInfo.invalidate_cache()
+    return NetworkInfo.get_local_addresses()
+
+
+def _list_printers_fresh():
+    """Re-query the spooler; blocks, so call it from a worker thread."""
+    # invalidate_cache() waits on the lock a running query holds
+    PrinterManager.invalidate_cache()
+    return tuple(PrinterManager.list_printers())
+
+
+def _center_on(parent, child, size):
+    """Give child its 'WxH' size, centered over parent when it is on screen.
+    
+    The size is known up front, so there is no need to flush pending layout
+    with update_idletasks() just to measure the child. If the parent is
+    hidden (e.g. in the tray), centering waits until the child is mapped.
+    """
+    if not parent.winfo_viewable():
+        child.geometry(size)
+        
+        def on_map(event):
+            # <Map> also fires for every widget inside the Toplevel
+            if event.widget is not child:
+                return
+            child.unbind('<Map>', funcid)
+            if parent.winfo_viewable():
+                _center_on(parent, child, size)
+        
+        funcid = child.bind('<Map>', on_map, add='+')
+        return
+    w, h = (int(v) for v in size.split('x'))
+    x = parent.winfo_x() + (parent.winfo_width() - w) // 2
+    y = parent.winfo_y() + (parent.winfo_height() - h) // 2
+    child.geometry(f'{size}+{x}+{y}')
+
 
 class PreferencesWindow(tk.Toplevel):
     """Settings dialog."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, on_save=None):
         super().__init__(parent)
         self.title('Preferences')
-        self.geometry('400x300')
         self.resizable(False, False)
         self.configure(bg=PALETTE['background'])
         
+        self._parent = parent
+        self._on_save = on_save
         self._setup_ui()
-        self._center_on_parent(parent)
+        _center_on(parent, self, '400x300')
         self.transient(parent)
         self.grab_set()
+        
+        # Kept around and shown again by PrintFlowApp instead of rebuilt
+        self.protocol('WM_DELETE_WINDOW', self.hide)
+    
+    def show(self):
+        """Re-show the dialog with the currently saved settings."""
+        self.auto_cut_var.set(config.get('enable_auto_cut', False))
+        self.port_var.set(str(config.get('port', 5000)))
+        self.minimized_var.set(config.get('start_minimized', False))
+        _center_on(self._parent, self, '400x300')
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+    
+    def hide(self):
+        self.grab_release()
+        self.withdraw()
     
     def _setup_ui(self):
         container = ttk.Frame(self, padding=20)
@@ -116,7 +245,7 @@ class PreferencesWindow(tk.Toplevel):
         ttk.Button(
             btn_frame,
             text='Cancel',
-            command=self.destroy
+            command=self.hide
         ).pack(side=tk.RIGHT, padx=5)
         
         ttk.Button(
@@ -128,112 +257,179 @@ class PreferencesWindow(tk.Toplevel):
     def _save(self):
         try:
             port = int(self.port_var.get())
-            if not (1024 <= port <= 65535):
-                raise ValueError('Port must be between 1024 and 65535')
+            # port + 1 is used by the loopback HTTP listener
+            if not (1024 <= port <= 65534):
+                raise ValueError('Port must be between 1024 and 65534')
         except ValueError as e:
             messagebox.showerror('Invalid Port', str(e), parent=self)
             return
         
-        config.set('enable_auto_cut', self.auto_cut_var.get())
-        config.set('port', port)
-        config.set('start_minimized', self.minimized_var.get())
+        with config.batch():
+            config.set('enable_auto_cut', self.auto_cut_var.get())
+            config.set('port', port)
+            config.set('start_minimized', self.minimized_var.get())
+        
+        if self._on_save:
+            self._on_save()
         
         messagebox.showinfo(
             'Settings Saved',
             'Your preferences have been saved.',
             parent=self
         )
-        self.destroy()
-    
-    def _center_on_parent(self, parent):
-        self.update_idletasks()
-        pw = parent.winfo_width()
-        ph = parent.winfo_height()
-        px = parent.winfo_x()
-        py = parent.winfo_y()
-        w = self.winfo_width()
-        h = self.winfo_height()
-        x = px + (pw - w) // 2
-        y = py + (ph - h) // 2
-        self.geometry(f'+{x}+{y}')
+        self.hide()
 
 
 class LogViewerWindow(tk.Toplevel):
     """Log viewer dialog."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, post):
         super().__init__(parent)
         self.title('Agent Logs')
-        self.geometry('700x500')
         self.configure(bg=PALETTE['background'])
         
+        # Thread-safe hand-off to the Tk thread, see PrintFlowApp._post
+        self._post = post
+        self._load_seq = 0
+        self._lines = []
+        
         self._setup_ui()
-        self._center_on_parent(parent)
+        _center_on(parent, self, '700x500')
         self._load_logs()
         self.transient(parent)
     
     def _setup_ui(self):
         # Toolbar
-        toolbar = ttk.Frame(self)
-        toolbar.pack(fill=tk.X, padx=10, pady=5)
+        self.toolbar = ttk.Frame(self)
+        self.toolbar.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Button(self.toolbar, text='Refresh', command=self._load_logs).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.toolbar, text='Open in Editor', command=self._open_file).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.toolbar, text='Clear Logs', command=self._clear_logs).pack(side=tk.LEFT, padx=2)
         
-        ttk.Button(toolbar, text='Refresh', command=self._load_logs).pack(side=tk.LEFT, padx=2)
-        ttk.Button(toolbar, text='Open in Editor', command=self._open_file).pack(side=tk.LEFT, padx=2)
-        ttk.Button(toolbar, text='Clear Logs', command=self._clear_logs).pack(side=tk.LEFT, padx=2)
+        # Clear confirmation, shown under the toolbar on demand
+        self.confirm_bar = ttk.Frame(self)
         
-        # Log text area
-        self.log_text = scrolledtext.ScrolledText(
-            self,
+        ttk.Label(
+            self.confirm_bar,
+            text='Delete all log entries?',
+            foreground=PALETTE['error']
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.confirm_bar, text='No', command=self._hide_confirm).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(self.confirm_bar, text='Yes', command=self._confirm_clear).pack(side=tk.RIGHT, padx=2)
+        
+        # Log lines; a Listbox only lays out the rows in view, unlike a
+        # Text widget which wraps and tracks every character
+        log_frame = ttk.Frame(self)
+        log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.log_list = tk.Listbox(
+            log_frame,
             font=('Consolas', 10),
             bg='#1e1e1e',
             fg='#d4d4d4',
-            insertbackground='white',
-            wrap=tk.WORD
+            selectbackground=PALETTE['primary'],
+            selectforeground='white',
+            selectmode=tk.EXTENDED,
+            activestyle='none'
         )
-        self.log_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        # Rows never wrap, so long lines scroll sideways instead
+        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_list.yview)
+        xscrollbar = ttk.Scrollbar(log_frame, orient=tk.HORIZONTAL, command=self.log_list.xview)
+        xscrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.log_list.config(yscrollcommand=scrollbar.set, xscrollcommand=xscrollbar.set)
+        
+        self.log_list.bind('<Control-c>', self._copy_selection)
     
     def _load_logs(self):
-        self.log_text.delete('1.0', tk.END)
+        # Disk I/O happens on a worker so the window stays responsive
+        self._load_seq += 1
+        self._apply_log_lines(self._load_seq, ['Loading...'], scroll=False)
+        threading.Thread(
+            target=self._read_log_bg,
+            args=(self._load_seq,),
+            daemon=True
+        ).start()
+    
+    def _read_log_bg(self, seq):
+        # Runs on the worker thread: no widget access, results go via _post
         try:
-            if LOG_PATH.exists():
-                content = LOG_PATH.read_text(encoding='utf-8')
-                # Show last 500 lines
-                lines = content.split('\n')[-500:]
-                self.log_text.insert('1.0', '\n'.join(lines))
-                self.log_text.see(tk.END)
-            else:
-                self.log_text.insert('1.0', 'No log file found.')
+            lines = [line.rstrip('\n') for line in _read_log_tail()]
+        except FileNotFoundError:
+            lines = ['No log file found.']
         except Exception as e:
-            self.log_text.insert('1.0', f'Error reading logs: {e}')
+            lines = [f'Error reading logs: {e}']
+        
+        self._post(self._apply_log_lines, seq, lines)
+    
+    def _apply_log_lines(self, seq, lines, scroll=True):
+        # Ignore results from a load superseded by a newer Refresh, or
+        # arriving after the window was closed while reading
+        if seq != self._load_seq or not self.winfo_exists():
+            return
+        self._lines = lines
+        self.log_list.delete(0, tk.END)
+        self._populate_chunks(seq, lines, 0, scroll)
+    
+    def _populate_chunks(self, seq, lines, idx, scroll):
+        # Insert a batch at a time, yielding to the event loop in between
+        if seq != self._load_seq or not self.winfo_exists():
+            return
+        
+        self.log_list.insert(tk.END, *lines[idx:idx + LOG_INSERT_BATCH])
+        
+        idx += LOG_INSERT_BATCH
+        if idx < len(lines):
+            self.after_idle(self._populate_chunks, seq, lines, idx, scroll)
+        elif scroll:
+            # Scroll once, after the last batch
+            self.log_list.see(tk.END)
+    
+    def _copy_selection(self, event=None):
+        selection = self.log_list.curselection()
+        if selection:
+            self.clipboard_clear()
+            self.clipboard_append('\n'.join(self._lines[i] for i in selection))
+        return 'break'
     
     def _open_file(self):
-        if LOG_PATH.exists():
+        if not LOG_PATH.exists():
+            return
+        try:
             if sys.platform == 'win32':
                 os.startfile(LOG_PATH)
-            elif sys.platform == 'darwin':
-                os.system(f'open "{LOG_PATH}"')
             else:
-                os.system(f'xdg-open "{LOG_PATH}"')
+                # Launch detached, without a shell, and don't wait for it
+                opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                subprocess.Popen(
+                    [opener, str(LOG_PATH)],
+                    start_new_session=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+        except OSError as e:
+            messagebox.showerror('Error', f'Failed to open log file: {e}', parent=self)
     
     def _clear_logs(self):
-        if messagebox.askyesno('Clear Logs', 'Delete all log entries?', parent=self):
-            try:
-                LOG_PATH.write_text('')
-                self._load_logs()
-            except Exception as e:
-                messagebox.showerror('Error', f'Failed to clear logs: {e}', parent=self)
+        # Ask inline rather than in a modal dialog with its own event loop
+        self.confirm_bar.pack(fill=tk.X, padx=10, pady=(0, 5), after=self.toolbar)
+    
+    def _hide_confirm(self):
+        self.confirm_bar.pack_forget()
     
-    def _center_on_parent(self, parent):
-        self.update_idletasks()
-        pw = parent.winfo_width()
-        ph = parent.winfo_height()
-        px = parent.winfo_x()
-        py = parent.winfo_y()
-        w = self.winfo_width()
-        h = self.winfo_height()
-        x = px + (pw - w) // 2
-        y = py + (ph - h) // 2
-        self.geometry(f'+{x}+{y}')
+    def _confirm_clear(self):
+        self._hide_confirm()
+        try:
+            with LOG_PATH.open('w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self._load_logs()
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to clear logs: {e}', parent=self)
 
 
 class AboutWindow(tk.Toplevel):
@@ -242,14 +438,27 @@ class AboutWindow(tk.Toplevel):
     def __init__(self, parent):
         super().__init__(parent)
         self.title('About')
-        self.geometry('350x250')
         self.resizable(False, False)
         self.configure(bg=PALETTE['surface'])
         
+        self._parent = parent
         self._setup_ui()
-        self._center_on_parent(parent)
+        _center_on(parent, self, '350x250')
         self.transient(parent)
         self.grab_set()
+        
+        # Kept around and shown again by PrintFlowApp instead of rebuilt
+        self.protocol('WM_DELETE_WINDOW', self.hide)
+    
+    def show(self):
+        _center_on(self._parent, self, '350x250')
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+    
+    def hide(self):
+        self.grab_release()
+        self.withdraw()
     
     def _setup_ui(self):
         container = ttk.Frame(self, padding=30)
@@ -286,20 +495,8 @@ class AboutWindow(tk.Toplevel):
         ttk.Button(
             container,
             text='Close',
-            command=self.destroy
+            command=self.hide
         ).pack(pady=20)
-    
-    def _center_on_parent(self, parent):
-        self.update_idletasks()
-        pw = parent.winfo_width()
-        ph = parent.winfo_height()
-        px = parent.winfo_x()
-        py = parent.winfo_y()
-        w = self.winfo_width()
-        h = self.winfo_height()
-        x = px + (pw - w) // 2
-        y = py + (ph - h) // 2
-        self.geometry(f'+{x}+{y}')
 
 
 class PrintFlowApp:
@@ -312,8 +509,24 @@ class PrintFlowApp:
         self.root.minsize(550, 600)
         self.root.configure(bg=PALETTE['background'])
         
+        # Settings the window displays, read once rather than per widget
+        self._cfg = {
+            'port': config.get('port', 5000),
+            'enable_auto_cut': config.get('enable_auto_cut', False),
+            'start_minimized': config.get('start_minimized', False),
+        }
+        
         self.tray_icon = None
         self.server_thread = None
+        self._flash_job = None
+        self._prefs_win = None
+        self._about_win = None
+        self._printers_cache = None
+        self._printers_ts = 0.0
+        self._printers_loading = False
+        
+        # Worker threads never touch Tk; they post callbacks here instead
+        self._ui_queue = queue.Queue()
         
         self._setup_styles()
         self._setup_ui()
@@ -330,11 +543,25 @@ class PrintFlowApp:
             self._setup_tray()
         
         # Check if should start minimized
-        if config.get('start_minimized', False) and HAS_TRAY:
+        if self._cfg['start_minimized'] and HAS_TRAY:
             self.root.after(100, self._minimize_to_tray)
+        
+        # Probe network addresses and printers once the event loop is running
+        self.root.after_idle(
+            self._run_in_background,
+            NetworkInfo.get_local_addresses,
+            self._populate_urls
+        )
+        self.root.after_idle(self._refresh_printers)
+        self.root.after(UI_POLL_INTERVAL, self._poll_ui_queue)
     
     def _setup_styles(self):
-        style = ttk.Style()
+        # Styles live in the Tcl interpreter, so configure each root once
+        if self.root in _STYLED_ROOTS:
+            return
+        _STYLED_ROOTS.add(self.root)
+        
+        style = ttk.Style(self.root)
         style.theme_use('clam')
         
         # Frame styles
@@ -412,14 +639,18 @@ class PrintFlowApp:
         self._create_toolbar(content)
         
         # Footer
-        footer = tk.Label(
+        self.footer_label = tk.Label(
             self.root,
-            text=f'© 2024 {APP_AUTHOR}  |  Auto-cut: {"ON" if config.get("enable_auto_cut") else "OFF"}',
+            text=self._footer_text(),
             bg=PALETTE['background'],
             fg=PALETTE['text_muted'],
             font=('Segoe UI', 9)
         )
-        footer.pack(pady=10)
+        self.footer_label.pack(pady=10)
+    
+    def _footer_text(self):
+        auto_cut = 'ON' if self._cfg['enable_auto_cut'] else 'OFF'
+        return f'© 2024 {APP_AUTHOR}  |  Auto-cut: {auto_cut}'
     
     def _create_status_card(self, parent):
         card = self._create_card(parent, 'Server Status')
@@ -443,10 +674,9 @@ class PrintFlowApp:
         )
         self.status_label.pack(side=tk.LEFT, padx=5)
         
-        port = config.get('port', 5000)
         ttk.Label(
             status_frame,
-            text=f'  Port {port}',
+            text=f'  Port {self._cfg["port"]}',
             foreground=PALETTE['text_muted']
         ).pack(side=tk.LEFT)
     
@@ -476,11 +706,8 @@ class PrintFlowApp:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.url_list.config(yscrollcommand=scrollbar.set)
         
-        # Populate URLs
-        port = config.get('port', 5000)
-        self.url_list.insert(tk.END, f'https://localhost:{port}')
-        for ip in NetworkInfo.get_local_addresses():
-            self.url_list.insert(tk.END, f'https://{ip}:{port}')
+        # Populate URLs; the rest are added once addresses are probed
+        self.url_list.insert(tk.END, *_url_list_for(self._cfg['port'], ()))
         
         # URL buttons
         url_btns = ttk.Frame(card, style='Card.TFrame')
@@ -488,6 +715,7 @@ class PrintFlowApp:
         
         ttk.Button(url_btns, text='Copy URL', command=self._copy_url).pack(side=tk.LEFT, padx=2)
         ttk.Button(url_btns, text='Open in Browser', command=self._open_url).pack(side=tk.LEFT, padx=2)
+        ttk.Button(url_btns, text='Refresh', command=self._refresh_urls).pack(side=tk.LEFT, padx=2)
         
         ttk.Label(
             card,
@@ -522,8 +750,8 @@ class PrintFlowApp:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.printer_list.config(yscrollcommand=scrollbar.set)
         
-        # Populate printers
-        self._refresh_printers()
+        # Populated once the event loop is running
+        self.printer_list.insert(tk.END, '(Refreshing...)')
         
         # Printer buttons
         printer_btns = ttk.Frame(card, style='Card.TFrame')
@@ -581,29 +809,42 @@ class PrintFlowApp:
         self.root.geometry(f'{w}x{h}+{x}+{y}')
     
     def _start_server(self):
-        def server_worker():
-            try:
-                run_server()
-            except Exception as e:
-                print(f'Server error: {e}')
-        
-        self.server_thread = threading.Thread(target=server_worker, daemon=True)
+        if self.server_thread and self.server_thread.is_alive():
+            return
+        self.server_thread = threading.Thread(
+            target=self._server_worker,
+            daemon=True,
+            name='printflow-server'
+        )
         self.server_thread.start()
     
+    def _server_worker(self):
+        # run_server retries the HTTPS bind and logs the traceback itself
+        try:
+            run_server(attempts=SERVER_START_ATTEMPTS, retry_delay=SERVER_RETRY_DELAY)
+        except Exception:
+            self._post(self._show_server_failed)
+    
+    def _show_server_failed(self):
+        if loopback_ready.is_set():
+            # Same-host clients can still print over plain HTTP
+            self.status_indicator.config(fg=PALETTE['accent'])
+            self.status_label.config(
+                text='HTTPS stopped, loopback HTTP only (see logs)',
+                foreground=PALETTE['accent']
+            )
+        else:
+            self.status_indicator.config(fg=PALETTE['error'])
+            self.status_label.config(text='Stopped (see logs)', foreground=PALETTE['error'])
+    
     def _setup_tray(self):
-        if not PilImage:
+        try:
+            import pystray
+            icon_img = _build_tray_icon()
+        except ImportError:
+            # Installed but unusable, e.g. no tray backend on this desktop
             return
         
-        # Create tray icon image
-        icon_size = 64
-        icon_img = PilImage.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(icon_img)
-        
-        # Draw printer shape
-        draw.rectangle([8, 16, 56, 48], fill=PALETTE['primary'], outline=None)
-        draw.rectangle([16, 8, 48, 20], fill=PALETTE['surface'], outline=PALETTE['primary'])
-        draw.rectangle([12, 44, 52, 56], fill=PALETTE['surface'], outline=PALETTE['primary'])
-        
         menu = (
             pystray.MenuItem('Show Window', self._show_window, default=True),
             pystray.MenuItem('Open Logs', self._show_logs),
@@ -620,6 +861,51 @@ class PrintFlowApp:
         
         threading.Thread(target=self.tray_icon.run, daemon=True).start()
     
+    def _run_in_background(self, work, callback, on_error=None):
+        """Run work() on a worker thread, then callback(result) on the Tk thread.
+        
+        If work() raises, on_error(exc) is called on the Tk thread instead.
+        """
+        def worker():
+            try:
+                result = work()
+            except Exception as e:
+                logger.exception('Background task failed')
+                if on_error:
+                    self._post(on_error, e)
+                return
+            self._post(callback, result)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _post(self, callback, *args):
+        """Queue callback(*args) to run on the Tk thread; safe from any thread."""
+        self._ui_queue.put((callback, args))
+    
+    def _poll_ui_queue(self):
+        # Tk calls from other threads fail until mainloop runs, so results
+        # are handed over through a queue the Tk thread drains itself
+        while True:
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception('UI callback failed')
+        
+        self.root.after(UI_POLL_INTERVAL, self._poll_ui_queue)
+    
+    def _refresh_urls(self):
+        # Keep the localhost entry, re-probe everything else
+        self.url_list.delete(1, tk.END)
+        self._run_in_background(_probe_addresses_fresh, self._populate_urls)
+    
+    def _populate_urls(self, addrs):
+        self.url_list.delete(0, tk.END)
+        self.url_list.insert(tk.END, *_url_list_for(self._cfg['port'], tuple(addrs)))
+    
     def _minimize_to_tray(self):
         if self.tray_icon:
             self.root.withdraw()
@@ -635,7 +921,7 @@ class PrintFlowApp:
             url = self.url_list.get(selection[0])
             self.root.clipboard_clear()
             self.root.clipboard_append(url)
-            messagebox.showinfo('Copied', f'URL copied to clipboard:\n{url}')
+            self._flash(f'Copied {url}')
     
     def _open_url(self):
         selection = self.url_list.curselection()
@@ -649,29 +935,77 @@ class PrintFlowApp:
             printer = self.printer_list.get(selection[0])
             self.root.clipboard_clear()
             self.root.clipboard_append(printer)
-            messagebox.showinfo('Copied', f'Printer name copied:\n{printer}')
+            self._flash(f'Copied {printer}')
+    
+    def _flash(self, msg):
+        # Brief non-modal notice in the footer
+        if self._flash_job:
+            self.root.after_cancel(self._flash_job)
+        self.footer_label.config(text=msg, fg=PALETTE['accent'])
+        self._flash_job = self.root.after(1500, self._clear_flash)
+    
+    def _clear_flash(self):
+        self._flash_job = None
+        self.footer_label.config(text=self._footer_text(), fg=PALETTE['text_muted'])
     
     def _refresh_printers(self):
+        # Coalesce rapid clicks onto the last result or the running query
+        if (self._printers_cache is not None
+                and time.monotonic() - self._printers_ts < PRINTER_REFRESH_TTL):
+            self._apply_printers(self._printers_cache)
+            return
+        if self._printers_loading:
+            return
+        
+        self._printers_loading = True
         self.printer_list.delete(0, tk.END)
-        printers = PrinterManager.list_printers()
+        self.printer_list.insert(tk.END, '(Refreshing...)')
         
-        if printers:
-            for p in printers:
-                self.printer_list.insert(tk.END, p)
-        else:
-            self.printer_list.insert(tk.END, '(No printers found)')
+        # Spooler queries can block, so they run off the UI thread
+        self._run_in_background(
+            _list_printers_fresh,
+            self._on_printers_loaded,
+            on_error=self._on_printers_failed
+        )
+    
+    def _on_printers_loaded(self, printers):
+        self._printers_loading = False
+        self._printers_cache = printers
+        self._printers_ts = time.monotonic()
+        self._apply_printers(printers)
+    
+    def _on_printers_failed(self, error):
+        self._printers_loading = False
+        self.printer_list.delete(0, tk.END)
+        self.printer_list.insert(tk.END, f'(Failed to list printers: {error})')
+    
+    def _apply_printers(self, printers):
+        self.printer_list.delete(0, tk.END)
+        self.printer_list.insert(tk.END, *(printers or ('(No printers found)',)))
     
     def _show_preferences(self):
-        PreferencesWindow(self.root)
+        if self._prefs_win is None or not self._prefs_win.winfo_exists():
+            self._prefs_win = PreferencesWindow(self.root, on_save=self._on_preferences_saved)
+        else:
+            self._prefs_win.show()
+    
+    def _on_preferences_saved(self):
+        # The port keeps showing the running server's until restart
+        self._cfg['enable_auto_cut'] = config.get('enable_auto_cut', False)
+        self._cfg['start_minimized'] = config.get('start_minimized', False)
+        self.footer_label.config(text=self._footer_text())
     
     def _show_logs(self):
-        LogViewerWindow(self.root)
+        LogViewerWindow(self.root, self._post)
     
     def _show_about(self):
-        AboutWindow(self.root)
+        if self._about_win is None or not self._about_win.winfo_exists():
+            self._about_win = AboutWindow(self.root)
+        else:
+            self._about_win.show()
     
     def _on_close(self):
-        if HAS_TRAY:
+        if self.tray_icon:
             self._minimize_to_tray()
         else:
             self._quit()